@@ -167,7 +167,8 @@ def fetch(path, urlbase=sub_urlbase_default, slice_=None,
     return data
 
 
-def download(path, urlbase=sub_urlbase_default, auth_cookie=None):
+def download(path, urlbase=sub_urlbase_default, auth_cookie=None,
+             dest_dir=None):
     """
     Download a dataset to storage.
 
@@ -184,6 +185,8 @@ def download(path, urlbase=sub_urlbase_default, auth_cookie=None):
         The base of URLs (slash-terminated) of the subscriber to query.
     auth_cookie : str
         An optional HTTP cookie for authorizing access.
+    dest_dir : str or pathlib.Path
+        The directory to save the file under, instead of the current one.
 
     Returns
     -------
@@ -192,7 +195,9 @@ def download(path, urlbase=sub_urlbase_default, auth_cookie=None):
     """
     urlbase, path = _format_paths(urlbase, path)
     url = api_utils.get_download_url(path, urlbase)
-    return api_utils.download_url(url, path, try_unpack=api_utils.blosc2_is_here,
+    localpath = path if dest_dir is None else str(pathlib.Path(dest_dir) / path)
+    return api_utils.download_url(url, localpath,
+                                  try_unpack=api_utils.blosc2_is_here,
                                   auth_cookie=auth_cookie)
 
 
@@ -421,10 +426,15 @@ class File:
                                     auth_cookie=self.auth_cookie)
         return data
 
-    def download(self):
+    def download(self, dest_dir=None):
         """
         Download a file to storage.
 
+        Parameters
+        ----------
+        dest_dir : str or pathlib.Path
+            The directory to save the file under, instead of the current one.
+
         Returns
         -------
         pathlib.PosixPath
@@ -438,7 +448,9 @@ class File:
         PosixPath('foo/ds-1d.b2nd')
         """
         urlpath = self.get_download_url()
-        return api_utils.download_url(urlpath, str(self.path),
+        localpath = (self.path if dest_dir is None
+                     else pathlib.Path(dest_dir) / self.path)
+        return api_utils.download_url(urlpath, str(localpath),
                                       auth_cookie=self.auth_cookie)
 
 
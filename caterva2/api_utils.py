@@ -6,6 +6,7 @@
 # License: GNU Affero General Public License v3.0
 # See LICENSE.txt for details about copyright and rights to use.
 ###############################################################################
+import http.cookiejar
 import os
 import pathlib
 import re
@@ -76,7 +77,8 @@ def get_auth_cookie(urlbase, user_auth):
     """
     if hasattr(user_auth, '_asdict'):  # named tuple (from tests)
         user_auth = user_auth._asdict()
-    resp = httpx.post(f'{urlbase}auth/jwt/login', data=user_auth)
+    client = get_client()
+    resp = client.post(f'{urlbase}auth/jwt/login', data=user_auth)
     resp.raise_for_status()
     auth_cookie = '='.join(list(resp.cookies.items())[0])
     return auth_cookie
@@ -119,7 +121,8 @@ _attachment_b2fname_rx = re.compile(r';\s*filename\*?\s*=\s*"([^"]+\.b2)"')
 
 def download_url(url, localpath, try_unpack=True, auth_cookie=None):
     headers = {'Cookie': auth_cookie} if auth_cookie else None
-    with httpx.stream("GET", url, headers=headers) as r:
+    client = get_client()
+    with client.stream("GET", url, headers=headers) as r:
         r.raise_for_status()
         # Build the local filepath
         cdisp = r.headers.get('content-disposition', '')
@@ -139,11 +142,35 @@ def download_url(url, localpath, try_unpack=True, auth_cookie=None):
 #
 # HTTP client helpers
 #
+# Created on import (instead of lazily) so that it is safe to use from
+# several threads.
+_client = httpx.Client(cookies=http.cookiejar.CookieJar(
+    http.cookiejar.DefaultCookiePolicy(allowed_domains=[])))
+
+
+def get_client():
+    """
+    Get the HTTP client shared by HTTP helpers.
+
+    Sharing the client allows reusing connections across requests.  Cookies
+    received in responses are never stored in it, so that authorization
+    only happens via explicitly given cookies.
+
+    Returns
+    -------
+    httpx.Client
+        The shared HTTP client.
+    """
+    return _client
+
+
 def _xget(url, params=None, headers=None, timeout=5, auth_cookie=None):
     if auth_cookie:
         headers = headers.copy() if headers else {}
         headers['Cookie'] = auth_cookie
-    response = httpx.get(url, params=params, headers=headers, timeout=timeout)
+    client = get_client()
+    response = client.get(url, params=params, headers=headers,
+                          timeout=timeout)
     response.raise_for_status()
     return response
 
@@ -157,6 +184,7 @@ def get(url, params=None, headers=None, timeout=5, model=None,
 
 def post(url, json=None, auth_cookie=None):
     headers = {'Cookie': auth_cookie} if auth_cookie else None
-    response = httpx.post(url, json=json, headers=headers)
+    client = get_client()
+    response = client.post(url, json=json, headers=headers)
     response.raise_for_status()
     return response.json()
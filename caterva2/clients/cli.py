@@ -145,7 +145,8 @@ def cmd_show(args, auth_cookie):
 @handle_errors
 @with_auth_cookie
 def cmd_download(args, auth_cookie):
-    path = cat2.download(args.dataset, args.urlbase, auth_cookie=auth_cookie)
+    path = cat2.download(args.dataset, args.urlbase, auth_cookie=auth_cookie,
+                         dest_dir=args.output_dir)
 
     print(f'Dataset saved to {path}')
 
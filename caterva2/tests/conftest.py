@@ -1,11 +1,13 @@
 from .conf import configuration  # noqa: F401
-from .files import examples_dir, examples_hdf5  # noqa: F401
-from .services import services  # noqa: F401
-from .sub_auth import sub_user, sub_jwt_cookie  # noqa: F401
+from .files import examples_dir, example_data, examples_hdf5  # noqa: F401
+from .services import services, pub_host, sub_urlbase  # noqa: F401
+from .sub_auth import sub_user, sub_jwt_cookie, sub_auth_headers  # noqa: F401
+from .sub_auth import sub_auth_enabled
 
 import caterva2 as cat2
 import httpx
 import numpy as np
+import pytest
 import sys
 import platform
 
@@ -17,6 +19,9 @@ except ImportError:
 
 
 def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', "requires_auth: skip test unless subscriber auth is on")
+
     print('\n' + '-=' * 38)
     print("Caterva2 version:      %s" % cat2.__version__)
     if blosc2 is not None:
@@ -27,3 +32,12 @@ def pytest_configure(config):
     print('Platform:              %s' % platform.platform())
     print('Rootdir:               %s' % config.rootdir)
     print('-=' * 38)
+
+
+def pytest_collection_modifyitems(config, items):
+    if sub_auth_enabled():
+        return
+    skip_auth = pytest.mark.skip(reason="authentication support needed")
+    for item in items:
+        if 'requires_auth' in item.keywords:
+            item.add_marker(skip_auth)
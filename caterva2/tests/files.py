@@ -4,6 +4,11 @@ import pytest
 
 from pathlib import Path
 
+try:  # Python-Blosc2 is optional
+    import blosc2
+except ImportError:
+    blosc2 = None
+
 try:
     from caterva2.services import hdf5root
 except ImportError:
@@ -24,6 +29,27 @@ def examples_dir():
     return get_examples_dir()
 
 
+@pytest.fixture(scope='session')
+def example_data(examples_dir):
+    """Function to get the whole data of an example file by name
+
+    Results are cached for the whole session, as long as the file is not
+    modified.
+    """
+    cache = {}
+
+    def get_example_data(name):
+        path = examples_dir / name
+        key = (name, path.stat().st_mtime_ns)
+        if key not in cache:
+            if path.suffix in {'.b2nd', '.b2frame'}:
+                cache[key] = blosc2.open(path)[:]
+            else:
+                cache[key] = path.read_bytes()
+        return cache[key]
+    return get_example_data
+
+
 def make_examples_hdf5(mkdtemp=lambda: Path(tempfile.mkdtemp())):
     if hdf5root is None:
         return None
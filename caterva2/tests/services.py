@@ -37,10 +37,16 @@ running before proceeding to tests.  It has three modes of operation:
   created and populated with the example files from the source distribution.
   When tests finish, the services are stopped.
 
+  When running managed services under pytest-xdist, each worker starts its
+  own services on a separate range of local ports, and `TEST_STATE_DIR` gets
+  the worker name appended (e.g. ``_caterva2_tests_gw0``), so that workers do
+  not interfere.  External services are shared by all workers.
+
   Usage example::
 
       $ cd Caterva2
       $ env CATERVA2_USE_EXTERNAL=1 pytest  # state in ``_caterva2_tests``
+      $ pytest -n auto --dist=loadfile  # state in ``_caterva2_tests_gw*``
 """
 
 import collections
@@ -62,17 +68,34 @@ import caterva2 as cat2
 from pathlib import Path
 
 
+USE_EXTERNAL = os.environ.get('CATERVA2_USE_EXTERNAL', '0') == '1'
+# Only managed services need to be kept apart between pytest-xdist workers,
+# external ones are shared by all workers at their usual endpoints.
+XDIST_WORKER = (None if USE_EXTERNAL
+                else os.environ.get('PYTEST_XDIST_WORKER'))  # e.g. ``gw0``
+
 DEFAULT_STATE_DIR = '_caterva2'
-TEST_STATE_DIR = DEFAULT_STATE_DIR + '_tests'
+TEST_STATE_DIR = DEFAULT_STATE_DIR + '_tests' + (
+    f'_{XDIST_WORKER}' if XDIST_WORKER else '')
 TEST_DEFAULT_ROOT = 'foo'
 TEST_CATERVA2_ROOT = TEST_DEFAULT_ROOT
 TEST_HDF5_ROOT = 'hdf5root'
 
 
-local_port_iter = itertools.count(8100)
+def get_local_port_base():
+    if not XDIST_WORKER:
+        return 8100
+    # Give each xdist worker its own range of ports.
+    return 8200 + 100 * int(XDIST_WORKER.removeprefix('gw'))
+
+
+local_port_iter = itertools.count(get_local_port_base())
 
 
 def service_ep_getter(first):
+    if XDIST_WORKER:
+        first = None  # default endpoints would clash between workers
+
     def get_service_ep():
         nonlocal first
         if first is not None:
@@ -195,11 +218,13 @@ class ManagedServices(Services):
         self._setup()
 
         self._start_proc('broker', check=bro_check(self.configuration))
+        bro_arg = '--broker=%s' % self.get_endpoint('broker')
         for root in self.roots:
             self._start_proc(f'publisher.{root.name}',
-                             root.name, self._get_data_path(root),
+                             bro_arg, root.name, self._get_data_path(root),
                              check=pub_check(root.name, self.configuration))
-        self._start_proc('subscriber', check=sub_check(self.configuration))
+        self._start_proc('subscriber', bro_arg,
+                         check=sub_check(self.configuration))
 
     def stop_all(self):
         for proc in self._procs.values():
@@ -267,7 +292,7 @@ def services(configuration, examples_dir, examples_hdf5):
 
     srvs = (ExternalServices(roots=roots,
                              configuration=configuration)
-            if os.environ.get('CATERVA2_USE_EXTERNAL', '0') == '1'
+            if USE_EXTERNAL
             else ManagedServices(TEST_STATE_DIR, reuse_state=False,
                                  roots=roots,
                                  configuration=configuration))
@@ -279,6 +304,18 @@ def services(configuration, examples_dir, examples_hdf5):
     srvs.wait_for_all()
 
 
+@pytest.fixture(scope='session')
+def pub_host(services):
+    """Endpoint of the publisher of the default test root"""
+    return services.get_endpoint(f'publisher.{TEST_CATERVA2_ROOT}')
+
+
+@pytest.fixture(scope='session')
+def sub_urlbase(services):
+    """Base of URLs (slash-terminated) provided by the subscriber"""
+    return services.get_urlbase('subscriber')
+
+
 # Inspired by <https://towerbabbel.com/go-defer-in-python/>.
 def defers(func):
     @functools.wraps(func)
@@ -73,3 +73,9 @@ def sub_jwt_cookie(sub_user, services):
                       data=dict(username=username, password=password))
     resp.raise_for_status()
     return '='.join(list(resp.cookies.items())[0])
+
+
+@pytest.fixture(scope='session')
+def sub_auth_headers(sub_jwt_cookie):
+    """HTTP headers for authorizing requests, if auth is enabled"""
+    return {'Cookie': sub_jwt_cookie} if sub_jwt_cookie else None
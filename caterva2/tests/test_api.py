@@ -6,12 +6,11 @@
 # License: GNU Affero General Public License v3.0
 # See LICENSE.txt for details about copyright and rights to use.
 ###############################################################################
-import contextlib
+import functools
 import pathlib
 
-import httpx
-
 import blosc2
+import httpx
 import pytest
 
 import caterva2 as cat2
@@ -21,27 +20,33 @@ from .services import TEST_CATERVA2_ROOT
 from .. import api_utils
 
 
-try:
-    chdir_ctxt = contextlib.chdir
-except AttributeError:  # Python < 3.11
-    import os
+@pytest.fixture(scope='module')
+def myroot(services, sub_urlbase, sub_user):
+    return cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
+                     user_auth=sub_user)
 
-    @contextlib.contextmanager
-    def chdir_ctxt(path):
-        cwd = os.getcwd()
-        os.chdir(path)
-        yield
-        os.chdir(cwd)
 
+@pytest.fixture(scope='module')
+def mynode(myroot):
+    """Function to get a file or dataset of `myroot` by name (cached)"""
+    return functools.cache(myroot.__getitem__)
 
-@pytest.fixture
-def pub_host(services):
-    return services.get_endpoint(f'publisher.{TEST_CATERVA2_ROOT}')
 
+# Slices to check when indexing datasets and files.
+index_slices = [1, slice(None, 1), slice(0, 10), slice(10, 20), slice(None),
+                slice(1, 5, 1)]
+index_slices_nd = index_slices + [(slice(None, 10), slice(None, 20))]
 
-@pytest.fixture
-def sub_urlbase(services):
-    return services.get_urlbase('subscriber')
+
+def check_index(ds, a, slice_):
+    """Check that getting and fetching `slice_` of `ds` matches `a`."""
+    for data in (ds[slice_], ds.fetch(slice_)):
+        if isinstance(a, bytes):
+            if isinstance(slice_, int):
+                data = ord(data)  # TODO: why do we need ord() here?
+            assert data == a[slice_]
+        else:
+            np.testing.assert_array_equal(data, a[slice_])
 
 
 def my_path(dspath, slice_):
@@ -53,16 +58,30 @@ def my_path(dspath, slice_):
     return dspath
 
 
+def test_client_stores_no_cookies():
+    client = api_utils.get_client()
+    request = httpx.Request('POST', 'http://localhost/auth/jwt/login')
+    response = httpx.Response(204, request=request,
+                              headers={'Set-Cookie': 'c2token=foo; Path=/'})
+    client.cookies.extract_cookies(response)  # as done for every response
+    assert not client.cookies
+
+
+@pytest.mark.requires_auth
+def test_login_stores_no_cookies(services, sub_urlbase, sub_user):
+    auth_cookie = api_utils.get_auth_cookie(sub_urlbase, sub_user)
+    assert auth_cookie
+    assert not api_utils.get_client().cookies
+
+
 def test_roots(services, pub_host, sub_urlbase, sub_jwt_cookie):
     roots = cat2.get_roots(sub_urlbase, auth_cookie=sub_jwt_cookie)
     assert roots[TEST_CATERVA2_ROOT]['name'] == TEST_CATERVA2_ROOT
     assert roots[TEST_CATERVA2_ROOT]['http'] == pub_host
 
 
-def test_lazyexpr(services, sub_urlbase, sub_jwt_cookie):
-    if not sub_jwt_cookie:
-        pytest.skip("authentication support needed")
-
+@pytest.mark.requires_auth
+def test_lazyexpr(services, example_data, sub_urlbase, sub_jwt_cookie):
     opnm = 'ds'
     oppt = f'{TEST_CATERVA2_ROOT}/ds-1d.b2nd'
     expression = f'{opnm} + 0'
@@ -83,207 +102,173 @@ def test_lazyexpr(services, sub_urlbase, sub_jwt_cookie):
     assert lxinfo['expression'] == f'({expression})'.replace(opnm, 'o0')
     assert lxinfo['operands'] == dict(o0=operands[opnm])
 
-    # Check result data.
-    a = cat2.fetch(oppt, sub_urlbase, auth_cookie=sub_jwt_cookie)
+    # Check result data against the expression evaluated locally.
+    a = example_data('ds-1d.b2nd')
     b = cat2.fetch(lxpath, sub_urlbase, auth_cookie=sub_jwt_cookie)
-    np.testing.assert_array_equal(a[:], b[:])
+    np.testing.assert_array_equal(a + 0, b)
 
 
-def test_root(services, sub_urlbase, sub_user):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
+def test_root(myroot, sub_urlbase):
     assert myroot.name == TEST_CATERVA2_ROOT
     assert myroot.urlbase == sub_urlbase
 
 
-def test_list(services, examples_dir, sub_urlbase, sub_user):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
+def test_list(myroot, examples_dir):
     example = examples_dir
     nodes = set(str(f.relative_to(str(example))) for f in example.rglob("*") if f.is_file())
     assert set(myroot.node_list) == nodes
 
 
-def test_file(services, sub_urlbase, sub_user):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
+def test_file(myroot, sub_urlbase):
     file = myroot['README.md']
     assert file.name == 'README.md'
     assert file.urlbase == sub_urlbase
 
 
-@pytest.mark.parametrize("slice_", [1, slice(None, 1), slice(0, 10), slice(10, 20), slice(None),
-                                    slice(10, 20, 1)])
-def test_index_dataset_frame(slice_, services, examples_dir, sub_urlbase,
-                             sub_user):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
-    ds = myroot['ds-hello.b2frame']
+@pytest.mark.parametrize("slice_", index_slices)
+def test_index_dataset_frame(slice_, mynode, example_data, sub_urlbase):
+    ds = mynode('ds-hello.b2frame')
     assert ds.name == 'ds-hello.b2frame'
     assert ds.urlbase == sub_urlbase
 
-    example = examples_dir / ds.name
-    a = blosc2.open(example)[:]
-    if isinstance(slice_, int):
-        assert ord(ds[slice_]) == a[slice_]  # TODO: why do we need ord() here?
-        assert ord(ds.fetch(slice_)) == a[slice_]
-    else:
-        assert ds[slice_] == a[slice_]
-        assert ds.fetch(slice_) == a[slice_]
-
-
-def test_dataset_step_diff_1(services, examples_dir, sub_urlbase, sub_user):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
+    a = example_data(ds.name)
+    check_index(ds, a, slice_)
+
+
+def test_dataset_step_diff_1(myroot, sub_urlbase):
     ds = myroot['ds-hello.b2frame']
     assert ds.name == 'ds-hello.b2frame'
     assert ds.urlbase == sub_urlbase
     # We don't support step != 1
-    with pytest.raises(Exception) as e_info:
+    with pytest.raises(IndexError, match='Only step=1 is supported'):
         _ = ds[::2]
-        assert str(e_info.value) == 'Only step=1 is supported'
 
 
-@pytest.mark.parametrize("slice_", [1, slice(None, 1), slice(0, 10), slice(10, 20), slice(None),
-                                    slice(1, 5, 1)])
-def test_index_dataset_1d(slice_, services, examples_dir, sub_urlbase,
-                          sub_user):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
-    ds = myroot['ds-1d.b2nd']
+@pytest.mark.parametrize("slice_", index_slices)
+def test_index_dataset_1d(slice_, mynode, example_data, sub_urlbase):
+    ds = mynode('ds-1d.b2nd')
     assert ds.name == 'ds-1d.b2nd'
     assert ds.urlbase == sub_urlbase
 
-    example = examples_dir / ds.name
-    a = blosc2.open(example)[:]
-    np.testing.assert_array_equal(ds[slice_], a[slice_])
-    np.testing.assert_array_equal(ds.fetch(slice_), a[slice_])
+    a = example_data(ds.name)
+    check_index(ds, a, slice_)
 
 
-@pytest.mark.parametrize("slice_", [1, slice(None, 1), slice(0, 10), slice(10, 20), slice(None),
-                                    slice(1, 5, 1), (slice(None, 10), slice(None, 20))])
+@pytest.mark.parametrize("slice_", index_slices_nd)
 @pytest.mark.parametrize("name", ['dir1/ds-2d.b2nd', 'dir2/ds-4d.b2nd'])
-def test_index_dataset_nd(slice_, name, services, examples_dir, sub_urlbase,
-                          sub_user):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
-    ds = myroot[name]
-    example = examples_dir / ds.name
-    a = blosc2.open(example)[:]
-    np.testing.assert_array_equal(ds[slice_], a[slice_])
-    np.testing.assert_array_equal(ds.fetch(slice_), a[slice_])
+def test_index_dataset_nd(slice_, name, mynode, example_data):
+    ds = mynode(name)
+    a = example_data(ds.name)
+    check_index(ds, a, slice_)
 
 
 @pytest.mark.parametrize("name", ['ds-1d.b2nd', 'dir1/ds-2d.b2nd'])
-def test_download_b2nd(name, services, examples_dir, sub_urlbase,
-                       sub_user, sub_jwt_cookie, tmp_path):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
+def test_download_b2nd(name, myroot, examples_dir, sub_auth_headers, tmp_path):
     ds = myroot[name]
-    with chdir_ctxt(tmp_path):
-        path = ds.download()
-        assert path == ds.path
+    path = ds.download(dest_dir=tmp_path)
+    assert path == tmp_path / ds.path
 
     # Data contents
     example = examples_dir / name
     a = blosc2.open(example)
-    with chdir_ctxt(tmp_path):
-        b = blosc2.open(path)
-        np.testing.assert_array_equal(a[:], b[:])
+    b = blosc2.open(path)
+    np.testing.assert_array_equal(a[:], b[:])
 
     # Using 2-step download
     urlpath = ds.get_download_url()
-    data = httpx.get(urlpath,
-                     headers={'Cookie': sub_jwt_cookie} if sub_user else None)
+    data = api_utils.get_client().get(urlpath, headers=sub_auth_headers)
     assert data.status_code == 200
     b = blosc2.ndarray_from_cframe(data.content)
     np.testing.assert_array_equal(a[:], b[:])
 
 
-def test_download_b2frame(services, examples_dir, sub_urlbase,
-                          sub_user, sub_jwt_cookie, tmp_path):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, sub_urlbase, user_auth=sub_user)
+def test_download_dest_dir(myroot, example_data, sub_urlbase, sub_jwt_cookie,
+                           tmp_path):
+    # `myroot` ensures that the root is subscribed to
+    dspath = f'{TEST_CATERVA2_ROOT}/ds-1d.b2nd'
+    path = cat2.download(dspath, sub_urlbase, auth_cookie=sub_jwt_cookie,
+                         dest_dir=tmp_path)
+    assert path == tmp_path / dspath
+
+    b = blosc2.open(path)
+    np.testing.assert_array_equal(example_data('ds-1d.b2nd'), b[:])
+
+
+def test_download_default_dir(myroot, example_data, sub_urlbase,
+                              sub_jwt_cookie, tmp_path, monkeypatch):
+    # Without `dest_dir`, files are saved under the current directory
+    monkeypatch.chdir(tmp_path)
+    ds = myroot['ds-1d.b2nd']
+    path = ds.download()
+    assert path == ds.path
+
+    path = cat2.download(str(ds.path), sub_urlbase,
+                         auth_cookie=sub_jwt_cookie)
+    assert path == ds.path
+
+    b = blosc2.open(tmp_path / path)
+    np.testing.assert_array_equal(example_data(ds.name), b[:])
+
+
+def test_download_b2frame(myroot, examples_dir, sub_urlbase, sub_auth_headers,
+                          tmp_path):
     ds = myroot['ds-hello.b2frame']
-    with chdir_ctxt(tmp_path):
-        path = ds.download()
-        assert path == ds.path
+    path = ds.download(dest_dir=tmp_path)
+    assert path == tmp_path / ds.path
 
     # Data contents
     example = examples_dir / ds.name
     a = blosc2.open(example)
-    with chdir_ctxt(tmp_path):
-        b = blosc2.open(path)
-        assert a[:] == b[:]
+    b = blosc2.open(path)
+    assert a[:] == b[:]
 
     # Using 2-step download
     urlpath = ds.get_download_url()
     assert urlpath == f"{sub_urlbase}api/fetch/{ds.path}"
-    data = httpx.get(urlpath,
-                     headers={'Cookie': sub_jwt_cookie} if sub_user else None)
+    data = api_utils.get_client().get(urlpath, headers=sub_auth_headers)
     assert data.status_code == 200
     b = blosc2.schunk_from_cframe(data.content)
     assert a[:] == b[:]
 
 
-@pytest.mark.parametrize("slice_", [1, slice(None, 1), slice(0, 10), slice(10, 20), slice(None),
-                                    slice(1, 5, 1)])
-def test_index_regular_file(slice_, services, examples_dir, sub_urlbase,
-                            sub_user):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
-    ds = myroot['README.md']
+@pytest.mark.parametrize("slice_", index_slices)
+def test_index_regular_file(slice_, mynode, example_data):
+    ds = mynode('README.md')
 
     # Data contents
-    example = examples_dir / ds.name
-    a = open(example).read().encode()
-    if isinstance(slice_, int):
-        assert ord(ds[slice_]) == a[slice_]  # TODO: why do we need ord() here?
-        assert ord(ds.fetch(slice_)) == a[slice_]
-    else:
-        assert ds[slice_] == a[slice_]
-        assert ds.fetch(slice_) == a[slice_]
-
-
-def test_download_regular_file(services, examples_dir, sub_urlbase,
-                               sub_user, sub_jwt_cookie, tmp_path):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
+    a = example_data(ds.name)
+    check_index(ds, a, slice_)
+
+
+def test_download_regular_file(myroot, example_data, sub_urlbase,
+                               sub_auth_headers, tmp_path):
     ds = myroot['README.md']
-    with chdir_ctxt(tmp_path):
-        path = ds.download()
-        assert path == ds.path
+    path = ds.download(dest_dir=tmp_path)
+    assert path == tmp_path / ds.path
 
     # Data contents
-    example = examples_dir / ds.name
-    a = open(example).read()
-    with chdir_ctxt(tmp_path):
-        b = open(path).read()
-        assert a[:] == b[:]
+    a = example_data(ds.name)
+    b = path.read_bytes()
+    assert a == b
 
     # Using 2-step download
     urlpath = ds.get_download_url()
     assert urlpath == f"{sub_urlbase}api/fetch/{ds.path}"
-    data = httpx.get(urlpath,
-                     headers={'Cookie': sub_jwt_cookie} if sub_user else None)
+    data = api_utils.get_client().get(urlpath, headers=sub_auth_headers)
     assert data.status_code == 200
     b = blosc2.schunk_from_cframe(data.content)
-    # TODO: why do we need .decode() here?
-    assert a[:] == b[:].decode()
+    assert a == b[:]
 
 
 @pytest.mark.parametrize("name", ['ds-1d.b2nd',
                                   'ds-hello.b2frame',
                                   'README.md'])
-def test_vlmeta(name, services, sub_urlbase, sub_user):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
+def test_vlmeta(name, myroot):
     ds = myroot[name]
     schunk_meta = ds.meta.get('schunk', ds.meta)
     assert ds.vlmeta is schunk_meta['vlmeta']
 
 
-def test_vlmeta_data(services, sub_urlbase, sub_user):
-    myroot = cat2.Root(TEST_CATERVA2_ROOT, urlbase=sub_urlbase,
-                       user_auth=sub_user)
+def test_vlmeta_data(myroot):
     ds = myroot['ds-sc-attr.b2nd']
     assert ds.vlmeta == dict(a=1, b="foo", c=123.456)
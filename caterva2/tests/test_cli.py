@@ -12,24 +12,14 @@ import json
 import subprocess
 import sys
 
-import pytest
-
 from .services import TEST_CATERVA2_ROOT
 
 
-@pytest.fixture
-def pub_host(services):
-    return services.get_endpoint(f'publisher.{TEST_CATERVA2_ROOT}')
-
-
-@pytest.fixture
-def sub_urlbase(services):
-    return services.get_urlbase('subscriber')
-
-
-def cli(cargs, binary=False, sub_user=None) -> str or dict:
+def cli(cargs, binary=False, sub_urlbase=None, sub_user=None) -> str or dict:
     cli_path = 'caterva2.clients.cli'
     args = [sys.executable, '-m' + str(cli_path)]
+    if sub_urlbase:
+        args += ['--subscriber', sub_urlbase]
     if sub_user:
         args += ['--username', sub_user.username,
                  '--password', sub_user.password]
@@ -42,29 +32,55 @@ def cli(cargs, binary=False, sub_user=None) -> str or dict:
     return out if binary else json.loads(out)
 
 
-def test_roots(services, pub_host, sub_user):
-    roots = cli(['roots'], sub_user=sub_user)
+def test_roots(services, pub_host, sub_urlbase, sub_user):
+    roots = cli(['roots'], sub_urlbase=sub_urlbase, sub_user=sub_user)
     assert roots[TEST_CATERVA2_ROOT]['name'] == TEST_CATERVA2_ROOT
     assert roots[TEST_CATERVA2_ROOT]['http'] == pub_host
 
 
 def test_url(services, sub_urlbase, sub_user):
-    out = cli(['url', f'{TEST_CATERVA2_ROOT}/ds-1d.b2nd'], sub_user=sub_user)
+    out = cli(['url', f'{TEST_CATERVA2_ROOT}/ds-1d.b2nd'],
+              sub_urlbase=sub_urlbase, sub_user=sub_user)
     assert out == f'{sub_urlbase}api/fetch/{TEST_CATERVA2_ROOT}/ds-1d.b2nd'
 
 
-def test_subscribe(services, sub_user):
+def test_subscribe(services, sub_urlbase, sub_user):
     # Subscribe once
-    out = cli(['subscribe', TEST_CATERVA2_ROOT], sub_user=sub_user)
+    out = cli(['subscribe', TEST_CATERVA2_ROOT],
+              sub_urlbase=sub_urlbase, sub_user=sub_user)
     assert out == 'Ok'
 
     # Subscribe again, should be a noop
-    out = cli(['subscribe', TEST_CATERVA2_ROOT], sub_user=sub_user)
+    out = cli(['subscribe', TEST_CATERVA2_ROOT],
+              sub_urlbase=sub_urlbase, sub_user=sub_user)
     assert out == 'Ok'
 
     # Show
     a = cli(['show', f'{TEST_CATERVA2_ROOT}/ds-1d.b2nd'],
-            binary=True, sub_user=sub_user)
+            binary=True, sub_urlbase=sub_urlbase, sub_user=sub_user)
     b = cli(['show', f'{TEST_CATERVA2_ROOT}/ds-1d.b2nd'],
-            binary=True, sub_user=sub_user)
+            binary=True, sub_urlbase=sub_urlbase, sub_user=sub_user)
     assert a == b
+
+
+def test_download(services, sub_urlbase, sub_user, tmp_path):
+    dspath = f'{TEST_CATERVA2_ROOT}/ds-1d.b2nd'
+    cli(['subscribe', TEST_CATERVA2_ROOT],
+        sub_urlbase=sub_urlbase, sub_user=sub_user)
+    out = cli(['download', dspath, str(tmp_path)],
+              binary=True, sub_urlbase=sub_urlbase, sub_user=sub_user)
+    assert out.strip() == f'Dataset saved to {tmp_path / dspath}'
+    assert (tmp_path / dspath).is_file()
+
+
+def test_download_default_dir(services, sub_urlbase, sub_user, tmp_path,
+                              monkeypatch):
+    # Without an output directory, files are saved under the current one
+    monkeypatch.chdir(tmp_path)
+    dspath = f'{TEST_CATERVA2_ROOT}/ds-1d.b2nd'
+    cli(['subscribe', TEST_CATERVA2_ROOT],
+        sub_urlbase=sub_urlbase, sub_user=sub_user)
+    out = cli(['download', dspath],
+              binary=True, sub_urlbase=sub_urlbase, sub_user=sub_user)
+    assert out.strip() == f'Dataset saved to {dspath}'
+    assert (tmp_path / dspath).is_file()
@@ -20,16 +20,23 @@ hdf5root = pytest.importorskip('caterva2.services.hdf5root',
                                reason="HDF5 support not present")
 
 
-@pytest.fixture
-def sub_urlbase(services):
-    return services.get_urlbase('subscriber')
+# Expected contents of example datasets (see `hdf5root.create_example_root()`).
+complex_2d = np.arange(100, dtype='complex128').reshape(10, 10)
+complex_2d *= 1 + 1j  # in place, i.e. x + xj
+uint8_3d = np.arange(1000, dtype='uint8').reshape(10, 10, 10)
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def api_root(sub_urlbase, sub_user):
     return cat2.Root(TEST_HDF5_ROOT, urlbase=sub_urlbase, user_auth=sub_user)
 
 
+@pytest.fixture(scope='module')
+def blosc2_3d_ds(api_root):
+    """The 3D Blosc2 dataset, with its info fetched once for all slices"""
+    return api_root['arrays/3d-blosc2.b2nd']
+
+
 def test_not_unsupported(api_root):
     for node in api_root.node_list:
         assert not node.startswith('unsupported/')
@@ -59,9 +66,7 @@ def test_nonchunked(api_root):
     ds_chunks = ds.meta['chunks']
     assert ds_chunks is not None and len(ds_chunks) == 2  # auto chunking
     v = ds[:]
-    a = np.arange(100, dtype='complex128').reshape(10, 10)
-    a = a + a*1j
-    np.testing.assert_array_equal(v, a)
+    np.testing.assert_array_equal(v, complex_2d)
 
 
 def test_chunked(api_root):
@@ -69,9 +74,7 @@ def test_chunked(api_root):
     ds_chunks = tuple(ds.meta['chunks'])
     assert ds_chunks == (4, 4)  # chunk shape is kept
     v = ds[:]
-    a = np.arange(100, dtype='complex128').reshape(10, 10)
-    a = a + a*1j
-    np.testing.assert_array_equal(v, a)
+    np.testing.assert_array_equal(v, complex_2d)
 
 
 def test_blosc2(api_root):
@@ -84,17 +87,14 @@ def test_blosc2(api_root):
     # assert cparams['filters'] == [0, 0, 0, 0, 0,
     #                               blosc2.Filter.BITSHUFFLE.value]
     v = ds[:]
-    a = np.arange(1000, dtype='uint8').reshape(10, 10, 10)
-    np.testing.assert_array_equal(v, a)
+    np.testing.assert_array_equal(v, uint8_3d)
 
 
 @pytest.mark.parametrize("slice_", [slice(None), 1, slice(2, 6),
                                     (slice(None, 6), slice(5, 8), slice(6))])
-def test_slicing(api_root, slice_):
-    ds = api_root['arrays/3d-blosc2.b2nd']
-    v = ds[:]
-    a = np.arange(1000, dtype='uint8').reshape(10, 10, 10)
-    np.testing.assert_array_equal(v[slice_], a[slice_])
+def test_slicing(blosc2_3d_ds, slice_):
+    v = blosc2_3d_ds[slice_]
+    np.testing.assert_array_equal(v, uint8_3d[slice_])
 
 
 def test_vlmeta(api_root):